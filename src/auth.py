@@ -3,6 +3,7 @@ sys.path.append("/Library/Frameworks/Python.framework/Versions/3.10/lib/python3.
 import requests
 import time
 import logging
+import threading
 from typing import Optional
 from interface import AuthService
 
@@ -15,6 +16,8 @@ class APIToken(AuthService):
         self.request_handler = request_handler
         self._access_token: Optional[str] = None
         self._token_expiry_epoch_seconds: float = 0.0
+        # Concurrent upload workers share one token; only one of them may refresh it
+        self._lock = threading.Lock()
         
     def auth(self) -> Optional[str]:
         logger.info("Starting authentication process")
@@ -48,12 +51,13 @@ class APIToken(AuthService):
         return self._access_token
     
     def get_token(self) -> str:
-        if not self._access_token or time.time() >= self._token_expiry_epoch_seconds:
-            logger.info("Token expired or not available, refreshing authentication")
-            self.auth()
-        else:
-            logger.debug("Using existing valid token")
-        return self._access_token or ""
+        with self._lock:
+            if not self._access_token or time.time() >= self._token_expiry_epoch_seconds:
+                logger.info("Token expired or not available, refreshing authentication")
+                self.auth()
+            else:
+                logger.debug("Using existing valid token")
+            return self._access_token or ""
 
     
     
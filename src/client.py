@@ -7,12 +7,15 @@ class ApiClient:
         self.auth_service: AuthService = auth_service
         self.request_handler: RequestHandler = request_handler
 
-    def request(self, method: str, endpoint: str, **kwargs: Any) -> Dict[str, Any]:
+    def send(self, method: str, endpoint: str, **kwargs: Any) -> Any:
         token: str = self.auth_service.get_token()
         headers: Dict[str, str] = kwargs.pop("headers", {})
         headers["Authorization"] = f"Bearer {token}"
         url: str = f"{self.server_url}/{endpoint.lstrip('/')}"
-        response = self.request_handler.send(method, url, headers=headers, **kwargs)
+        return self.request_handler.send(method, url, headers=headers, **kwargs)
+
+    def request(self, method: str, endpoint: str, **kwargs: Any) -> Dict[str, Any]:
+        response = self.send(method, endpoint, **kwargs)
 
         if getattr(response, "status_code", None) == 200 and not getattr(response, "text", "").strip():
             return {"status": "success", "message": "Operation completed successfully"}
@@ -1,4 +1,100 @@
+import queue
+import logging
+import threading
 from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from interface import Sink
+
+logger = logging.getLogger(__name__)
+
+class SinkRunner:
+    # Bounded queue: a slow sink blocks the shared stream, not the other sinks' workers
+    def __init__(self, sink: Sink, queue_depth: int = 4) -> None:
+        self.sink: Sink = sink
+        self.batch_size: int = max(1, sink.batch_size)
+        self.queue: "queue.Queue[Optional[Tuple[int, List[Dict[str, Any]]]]]" = queue.Queue(maxsize=queue_depth)
+        self.written: int = 0
+        self.failed: int = 0
+        self._pending: List[Dict[str, Any]] = []
+        self._batch_num: int = 0
+        self._lock = threading.Lock()
+        self._threads = [
+            threading.Thread(target=self._work, name=f"{sink.name}-{i + 1}", daemon=True)
+            for i in range(max(1, sink.workers))
+        ]
+
+    def start(self) -> None:
+        self.sink.open()
+        for thread in self._threads:
+            thread.start()
+
+    def offer(self, row: Dict[str, Any]) -> None:
+        self._pending.append(row)
+        if len(self._pending) >= self.batch_size:
+            self._dispatch()
+
+    def _dispatch(self) -> None:
+        self._batch_num += 1
+        self.queue.put((self._batch_num, self._pending))
+        self._pending = []
+
+    def finish(self) -> None:
+        if self._pending:
+            self._dispatch()
+        for _ in self._threads:
+            self.queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self.sink.close()
+
+    def _work(self) -> None:
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            batch_num, rows = item
+            try:
+                written = self.sink.write_batch(batch_num, rows)
+            except Exception as e:
+                logger.error(f"Sink '{self.sink.name}' failed on batch {batch_num}: {e}")
+                written = 0
+            with self._lock:
+                self.written += written
+                self.failed += len(rows) - written
+
+
+def _finish_all(runners: List[SinkRunner]) -> Optional[BaseException]:
+    # Every runner is stopped, joined and closed even if another one fails; returns the first error
+    first_error = None
+    for runner in runners:
+        try:
+            runner.finish()
+        except Exception as e:
+            logger.error(f"Sink '{runner.sink.name}' failed to finish: {e}")
+            if first_error is None:
+                first_error = e
+    return first_error
+
+
+def fan_out(rows: Iterable[Dict[str, Any]], sinks: List[Sink], queue_depth: int = 4) -> Dict[str, Tuple[int, int]]:
+    # Returns (written, failed) per sink name
+    runners = [SinkRunner(sink, queue_depth) for sink in sinks]
+    started = []
+    try:
+        for runner in runners:
+            runner.start()
+            started.append(runner)
+        for row in rows:
+            for runner in runners:
+                runner.offer(row)
+    except BaseException:
+        _finish_all(started)
+        raise
+    error = _finish_all(started)
+    if error is not None:
+        raise error
+    return {runner.sink.name: (runner.written, runner.failed) for runner in runners}
+
 
 class DataConnector(ABC):
     @abstractmethod
@@ -11,6 +107,12 @@ class DataConnector(ABC):
     def write(self, data):
         pass
 
+    def sinks(self) -> List[Sink]:
+        return []
+
+    def write_to_sinks(self, data: Iterable[Dict[str, Any]]) -> Dict[str, Tuple[int, int]]:
+        return fan_out(data, self.sinks())
+
     def run(self):
         raw = self.read()
         transformed = self.transform(raw)
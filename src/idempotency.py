@@ -0,0 +1,44 @@
+import os
+import hashlib
+import logging
+import threading
+from typing import Optional, Set
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+
+def batch_key(fingerprint: Optional[str], batch_num: int, payload: bytes) -> str:
+    digest = hashlib.sha256()
+    digest.update((fingerprint or "").encode("utf-8"))
+    digest.update(f"\n{batch_num}\n".encode("utf-8"))
+    digest.update(payload)
+    return digest.hexdigest()
+
+
+class AckLedger:
+    # Without a path the acknowledged keys only live for the current process
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path: Optional[str] = path
+        self._keys: Set[str] = set()
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self._keys.update(line.strip() for line in f if line.strip())
+            logger.info(f"Loaded {len(self._keys)} acknowledged keys from {path}")
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def record(self, key: str) -> None:
+        with self._lock:
+            if key in self._keys:
+                return
+            self._keys.add(key)
+            if self.path:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(key + "\n")
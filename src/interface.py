@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Dict, List
 
 class AuthService(ABC):
     @abstractmethod
@@ -10,3 +10,20 @@ class RequestHandler(ABC):
     @abstractmethod
     def send(self, method: str, url: str, **kwargs: Any) -> Any:
         pass
+
+class Sink(ABC):
+    # Rows are shared between sinks and must not be mutated
+    name: str = "sink"
+    batch_size: int = 1000
+    workers: int = 1
+
+    def open(self) -> None:
+        pass
+
+    @abstractmethod
+    def write_batch(self, batch_num: int, rows: List[Dict[str, Any]]) -> int:
+        # Returns how many rows were written
+        pass
+
+    def close(self) -> None:
+        pass
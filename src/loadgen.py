@@ -0,0 +1,223 @@
+import sys
+import requests
+import os
+import math
+import time
+import uuid
+import random
+import logging
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Iterator, Any, Optional
+from interface import RequestHandler as BaseRequestHandler
+from client import ApiClient
+from csv_connector import CSVConnector
+
+logger = logging.getLogger(__name__)
+
+FIRST_NAMES = ["Susan", "Michael", "Billy", "Brandy", "John", "Jane", "Maria", "David"]
+LAST_NAMES = ["Lee", "Hicks", "Rivera", "Hart", "Doe", "Roe", "Smith", "Garcia"]
+
+
+def synthetic_rows(count: int, seed: Optional[int] = None) -> Iterator[Dict[str, str]]:
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield {
+            "Name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "Age": str(rng.randint(1, 99)),
+            "Cookie": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "Banner_id": str(rng.randint(0, 99)),
+        }
+
+
+def load_rows(connector: CSVConnector, source: str = "csv", synthetic_count: int = 10000) -> List[Dict[str, Any]]:
+    raw = synthetic_rows(synthetic_count) if source == "synthetic" else connector.read()
+    return connector.transform(raw)
+
+
+class SingleAttemptRequestHandler(BaseRequestHandler):
+    # No retries or backoff: they would hide the 429/500 rates the load generator reports
+    def __init__(self, timeout: float = 30.0) -> None:
+        self.timeout: float = timeout
+        self._local = threading.local()
+
+    def send(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            self._local.session = session
+        kwargs.setdefault("timeout", self.timeout)
+        return session.request(method, url, **kwargs)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    # Nearest-rank percentile
+    rank = math.ceil(pct / 100.0 * len(sorted_values)) - 1
+    return sorted_values[max(0, min(rank, len(sorted_values) - 1))]
+
+
+class LoadGenerator:
+    def __init__(self, api_client: ApiClient, rows: List[Dict[str, Any]], upload_mode: str = "bulk",
+                 batch_size: int = 1000, concurrency: int = 8) -> None:
+        if not rows:
+            raise ValueError("Load generator needs at least one valid row to replay")
+        self.api_client: ApiClient = api_client
+        self.rows: List[Dict[str, Any]] = rows
+        self.upload_mode: str = upload_mode
+        self.batch_size: int = min(batch_size, 1000) if upload_mode == "bulk" else 1
+        self.concurrency: int = concurrency
+        self._cursor = 0
+        self._cursor_lock = threading.Lock()
+
+    def _next_records(self) -> List[Dict[str, Any]]:
+        with self._cursor_lock:
+            start = self._cursor
+            self._cursor = (self._cursor + self.batch_size) % len(self.rows)
+        records = []
+        for offset in range(self.batch_size):
+            row = self.rows[(start + offset) % len(self.rows)]
+            records.append({"VisitorCookie": row["customer_cookies"], "BannerId": row["customer_banner_id"]})
+        return records
+
+    def _send_one(self, scheduled_at: float) -> Dict[str, Any]:
+        records = self._next_records()
+        try:
+            if self.upload_mode == "bulk":
+                response = self.api_client.send("POST", "banners/show/bulk", json={"Data": records})
+            else:
+                response = self.api_client.send("POST", "banners/show", json=records[0])
+            status = response.status_code
+        except Exception as e:
+            logger.debug("Load request failed: %s", e)
+            status = None
+        # Measured from the scheduled send time so queueing behind a saturated pool counts as latency
+        return {"status": status, "latency": time.monotonic() - scheduled_at, "rows": len(records)}
+
+    def run_step(self, rate: float, unit: str = "requests", duration: float = 10.0) -> Dict[str, Any]:
+        request_rate = rate / self.batch_size if unit == "rows" else rate
+        if request_rate <= 0:
+            raise ValueError(f"Target rate must be positive, got {rate} {unit}/s")
+        logger.info(f"Load step: {rate} {unit}/s ({request_rate:.2f} requests/s) for {duration}s")
+
+        futures = []
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            start = time.monotonic()
+            i = 0
+            # Open loop: request i is due at start + i / request_rate however long earlier ones take
+            while i / request_rate < duration:
+                scheduled_at = start + i / request_rate
+                delay = scheduled_at - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                futures.append(pool.submit(self._send_one, scheduled_at))
+                i += 1
+            results = [f.result() for f in futures]
+            elapsed = max(time.monotonic() - start, duration)
+
+        return self._summarize(rate, unit, duration, elapsed, results)
+
+    def run(self, ramp: List[float], unit: str = "requests", step_duration: float = 10.0) -> List[Dict[str, Any]]:
+        # Authenticate up front so the first request of the first step is not charged for it
+        self.api_client.auth_service.get_token()
+        return [self.run_step(rate, unit, step_duration) for rate in ramp]
+
+    @staticmethod
+    def _summarize(rate: float, unit: str, duration: float, elapsed: float, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        statuses = Counter(r["status"] for r in results)
+        latencies = sorted(r["latency"] for r in results)
+        total = len(results)
+        sent = sum(r["rows"] for r in results)
+        # Only 200 responses count as achieved; the open-loop offered rate always tracks the target
+        accepted = [r for r in results if r["status"] == 200]
+        accepted_rows = sum(r["rows"] for r in accepted)
+        return {
+            "target_rate": rate,
+            "unit": unit,
+            "duration": duration,
+            "requests": total,
+            "rows": sent,
+            "accepted_requests": len(accepted),
+            "accepted_rows": accepted_rows,
+            "offered_requests_per_sec": total / elapsed,
+            "offered_rows_per_sec": sent / elapsed,
+            "achieved_requests_per_sec": len(accepted) / elapsed,
+            "achieved_rows_per_sec": accepted_rows / elapsed,
+            "latency_p50": percentile(latencies, 50),
+            "latency_p90": percentile(latencies, 90),
+            "latency_p99": percentile(latencies, 99),
+            "latency_max": latencies[-1] if latencies else 0.0,
+            "status_counts": dict(statuses),
+            "rate_429": statuses[429] / total if total else 0.0,
+            "rate_500": statuses[500] / total if total else 0.0,
+            "error_rate": statuses[None] / total if total else 0.0,
+        }
+
+
+def log_report(results: List[Dict[str, Any]]) -> None:
+    logger.info("Load test report:")
+    for step in results:
+        logger.info(
+            f"  target {step['target_rate']} {step['unit']}/s: "
+            f"offered {step['offered_requests_per_sec']:.1f} req/s, {step['offered_rows_per_sec']:.1f} rows/s; "
+            f"achieved (200 OK) {step['achieved_requests_per_sec']:.1f} req/s, {step['achieved_rows_per_sec']:.1f} rows/s; "
+            f"latency p50 {step['latency_p50'] * 1000:.0f}ms, p90 {step['latency_p90'] * 1000:.0f}ms, "
+            f"p99 {step['latency_p99'] * 1000:.0f}ms, max {step['latency_max'] * 1000:.0f}ms; "
+            f"429 {step['rate_429']:.1%}, 500 {step['rate_500']:.1%}, errors {step['error_rate']:.1%}"
+        )
+
+
+def main():
+    log_level = os.getenv("LOG_LEVEL", "INFO").upper()
+    logging.basicConfig(
+        level=getattr(logging, log_level, logging.INFO),
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.StreamHandler(sys.stdout)
+        ]
+    )
+    logger.info("Starting load generator")
+
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+        logger.info("Loaded configuration from .env file")
+    except ImportError:
+        logger.warning("python-dotenv not installed, using environment variables and defaults")
+
+    # Load configuration
+    server_url = os.getenv("SHOWADS_API_URL")
+    project_key = os.getenv("PROJECT_KEY")
+    csv_path = os.getenv("CSV_PATH", "src/data.csv")
+    batch_size = int(os.getenv("BATCH_SIZE", "1000"))
+    upload_mode = os.getenv("UPLOAD_MODE", "bulk")
+    source = os.getenv("LOADGEN_SOURCE", "csv").strip().lower()
+    synthetic_count = int(os.getenv("LOADGEN_SYNTHETIC_ROWS", "10000"))
+    ramp = [float(r) for r in os.getenv("LOADGEN_RATE", "1").split(",") if r.strip()]
+    unit = os.getenv("LOADGEN_UNIT", "requests").strip().lower()
+    step_duration = float(os.getenv("LOADGEN_STEP_DURATION", "10"))
+    concurrency = int(os.getenv("LOADGEN_CONCURRENCY", "8"))
+
+    # Validate required credentials
+    if not server_url:
+        logger.error("SHOWADS_API_URL not found in environment variables")
+        raise ValueError("SHOWADS_API_URL must be set in .env file")
+    if not project_key:
+        logger.error("PROJECT_KEY not found in environment variables")
+        raise ValueError("PROJECT_KEY must be set in .env file")
+    if unit not in ("requests", "rows"):
+        raise ValueError(f"LOADGEN_UNIT must be 'requests' or 'rows', got '{unit}'")
+
+    connector = CSVConnector(csv_path, server_url, project_key, batch_size, upload_mode)
+    rows = load_rows(connector, source, synthetic_count)
+    api_client = ApiClient(server_url, connector.auth_service, SingleAttemptRequestHandler())
+    # Spool mode has no network side; replay it as bulk traffic
+    mode = "single" if connector.upload_mode == "single" else "bulk"
+    generator = LoadGenerator(api_client, rows, mode, connector.batch_size, concurrency)
+
+    log_report(generator.run(ramp, unit, step_duration))
+
+if __name__ == "__main__":
+    main()
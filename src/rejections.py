@@ -0,0 +1,80 @@
+import csv
+import random
+import logging
+from collections import Counter
+from typing import Dict, List, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+WRITE_BUFFER_BYTES = 64 * 1024
+# Header used when a run has no rejects and the first rejected row can't provide one
+DEFAULT_COLUMNS = ["Name", "Age", "Cookie", "Banner_id"]
+
+
+class RejectionReport:
+    def __init__(self, sample_size: int = 5, rejects_path: Optional[str] = None, seed: Optional[int] = None) -> None:
+        self.sample_size: int = sample_size
+        self.rejects_path: Optional[str] = rejects_path
+        self.counts: Counter = Counter()
+        self.samples: Dict[str, List[Dict[str, Any]]] = {}
+        self._random = random.Random(seed)
+        self._file = None
+        self._writer = None
+        self._closed = False
+
+    def add(self, reason: str, row_number: int, row: Dict[str, Any]) -> None:
+        self.counts[reason] += 1
+        seen = self.counts[reason]
+        sample = self.samples.setdefault(reason, [])
+        # Reservoir sampling (Algorithm R): every reject has an equal chance to be kept
+        if len(sample) < self.sample_size:
+            sample.append({"row_number": row_number, "row": row})
+        else:
+            slot = self._random.randrange(seen)
+            if slot < self.sample_size:
+                sample[slot] = {"row_number": row_number, "row": row}
+        if self.rejects_path:
+            self._write(reason, row_number, row)
+
+    def _open(self, columns: List[str]) -> None:
+        fieldnames = ["Row", "Reason"] + columns
+        self._file = open(self.rejects_path, "w", newline="", encoding="utf-8", buffering=WRITE_BUFFER_BYTES)
+        self._writer = csv.DictWriter(self._file, fieldnames=fieldnames, restval="", extrasaction="ignore")
+        self._writer.writeheader()
+
+    def _write(self, reason: str, row_number: int, row: Dict[str, Any]) -> None:
+        if self._writer is None:
+            self._open([k for k in row.keys() if k is not None])
+        record = dict(row)
+        record["Row"] = row_number
+        record["Reason"] = reason
+        self._writer.writerow(record)
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        # Truncate a rejects file left by an earlier run even when nothing was rejected
+        if self.rejects_path and self._writer is None:
+            self._open(DEFAULT_COLUMNS)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._writer = None
+
+    def log_summary(self) -> None:
+        if not self.counts:
+            logger.info("No rows were rejected during validation")
+        else:
+            logger.warning("%s rows rejected during validation", self.total)
+        for reason, count in self.counts.most_common():
+            logger.warning("  %s: %s rows", reason, count)
+            if logger.isEnabledFor(logging.DEBUG):
+                for example in self.samples.get(reason, []):
+                    logger.debug("    example row %s: %s", example["row_number"], example["row"])
+        if self.rejects_path:
+            logger.info("Rejected rows written to %s", self.rejects_path)
@@ -0,0 +1,142 @@
+import os
+import json
+import time
+import logging
+from typing import List, Dict, Any, Optional
+from interface import Sink
+from client import ApiClient
+from idempotency import AckLedger, IDEMPOTENCY_HEADER, batch_key
+from spool import reset_spool, write_segment, write_manifest, encode_bulk_payload
+
+logger = logging.getLogger(__name__)
+
+WRITE_BUFFER_BYTES = 64 * 1024
+
+
+def show_record(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {"VisitorCookie": row["customer_cookies"], "BannerId": row["customer_banner_id"]}
+
+
+class ShowAdsBulkSink(Sink):
+    name = "showads-bulk"
+
+    def __init__(self, api_client: ApiClient, batch_size: int = 1000, workers: int = 1, request_delay: float = 0.0,
+                 ledger: Optional[AckLedger] = None, fingerprint: Optional[str] = None) -> None:
+        if batch_size > 1000:
+            logger.warning("Bulk batch size %s exceeds API limit of 1000. Capping to 1000.", batch_size)
+        self.api_client: ApiClient = api_client
+        self.batch_size = min(batch_size, 1000)
+        self.workers = workers
+        self.request_delay: float = request_delay
+        self.ledger: AckLedger = ledger if ledger is not None else AckLedger()
+        self.fingerprint: Optional[str] = fingerprint
+
+    def write_batch(self, batch_num: int, rows: List[Dict[str, Any]]) -> int:
+        bulk_data = [show_record(row) for row in rows]
+        logger.debug(f"Prepared bulk data for batch {batch_num}: {len(bulk_data)} records")
+        key = batch_key(self.fingerprint, batch_num, encode_bulk_payload(bulk_data))
+        if key in self.ledger:
+            logger.info(f"Batch {batch_num} already acknowledged (key {key[:12]}), skipping")
+            return len(bulk_data)
+        logger.info(f"Sending batch {batch_num} to API (bulk)")
+        _ = self.api_client.request("POST", "banners/show/bulk", json={"Data": bulk_data}, headers={IDEMPOTENCY_HEADER: key})
+        self.ledger.record(key)
+        logger.debug(f"Waiting {self.request_delay}s before next batch")
+        if self.request_delay > 0:
+            time.sleep(self.request_delay)
+        return len(bulk_data)
+
+
+class ShowAdsSingleSink(Sink):
+    name = "showads-single"
+
+    def __init__(self, api_client: ApiClient, batch_size: int = 1000, workers: int = 1, request_delay: float = 0.0) -> None:
+        self.api_client: ApiClient = api_client
+        self.batch_size = batch_size
+        self.workers = workers
+        self.request_delay: float = request_delay
+
+    def write_batch(self, batch_num: int, rows: List[Dict[str, Any]]) -> int:
+        sent = 0
+        for idx, row in enumerate(rows, start=1):
+            try:
+                logger.debug(f"Sending row {idx} of batch {batch_num} to API (single-item)")
+                _ = self.api_client.request("POST", "banners/show", json=show_record(row))
+                sent += 1
+            except Exception as row_err:
+                logger.error(f"Failed to send row {idx} of batch {batch_num}: {row_err}")
+            if self.request_delay > 0:
+                time.sleep(self.request_delay)
+        return sent
+
+
+class SpoolSink(Sink):
+    name = "spool"
+
+    def __init__(self, spool_dir: str, batch_size: int = 1000, fingerprint: Optional[str] = None, overwrite: bool = False) -> None:
+        self.spool_dir: str = spool_dir
+        self.overwrite: bool = overwrite
+        self.batch_size = min(batch_size, 1000)
+        self.fingerprint: Optional[str] = fingerprint
+
+    def open(self) -> None:
+        logger.info(f"Spooling bulk payloads to {self.spool_dir}")
+        reset_spool(self.spool_dir, self.overwrite)
+        write_manifest(self.spool_dir, self.fingerprint)
+
+    def write_batch(self, batch_num: int, rows: List[Dict[str, Any]]) -> int:
+        path = write_segment(self.spool_dir, batch_num, [show_record(row) for row in rows])
+        logger.debug(f"Spooled batch {batch_num} to {path}")
+        return len(rows)
+
+
+class NdjsonSink(Sink):
+    name = "ndjson"
+
+    def __init__(self, path: str, batch_size: int = 1000) -> None:
+        self.path: str = path
+        self.batch_size = batch_size
+        self._file = None
+
+    def open(self) -> None:
+        logger.info(f"Archiving rows as NDJSON to {self.path}")
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self.path, "w", encoding="utf-8", buffering=WRITE_BUFFER_BYTES)
+
+    def write_batch(self, batch_num: int, rows: List[Dict[str, Any]]) -> int:
+        self._file.write("".join(json.dumps(row, separators=(",", ":")) + "\n" for row in rows))
+        return len(rows)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class ColumnarSink(Sink):
+    # One JSON line per batch mapping each column to its values, like a Parquet row group
+    name = "columnar"
+
+    def __init__(self, path: str, batch_size: int = 1000) -> None:
+        self.path: str = path
+        self.batch_size = batch_size
+        self._file = None
+
+    def open(self) -> None:
+        logger.info(f"Archiving rows as columnar row groups to {self.path}")
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self.path, "w", encoding="utf-8", buffering=WRITE_BUFFER_BYTES)
+
+    def write_batch(self, batch_num: int, rows: List[Dict[str, Any]]) -> int:
+        columns: Dict[str, List[Any]] = {}
+        for row in rows:
+            for column, value in row.items():
+                columns.setdefault(column, []).append(value)
+        group = {"row_group": batch_num, "num_rows": len(rows), "columns": columns}
+        self._file.write(json.dumps(group, separators=(",", ":")) + "\n")
+        return len(rows)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,126 @@
+import os
+import json
+import time
+import glob
+import logging
+from typing import List, Dict, Any, Tuple, Optional
+from client import ApiClient
+from idempotency import AckLedger, IDEMPOTENCY_HEADER, batch_key
+
+logger = logging.getLogger(__name__)
+
+MAX_SEGMENT_RECORDS = 1000
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".json"
+SENT_SUFFIX = ".sent"
+MANIFEST_NAME = "manifest.json"
+LEDGER_NAME = "acked_keys"
+
+
+def encode_bulk_payload(records: List[Dict[str, Any]]) -> bytes:
+    return json.dumps({"Data": records}, separators=(",", ":")).encode("utf-8")
+
+
+def segment_path(spool_dir: str, index: int) -> str:
+    return os.path.join(spool_dir, f"{SEGMENT_PREFIX}{index:06d}{SEGMENT_SUFFIX}")
+
+
+def reset_spool(spool_dir: str, overwrite: bool = False) -> None:
+    os.makedirs(spool_dir, exist_ok=True)
+    # Never-uploaded segments are only discarded on request; *.sent and *.tmp always go
+    pending = pending_segments(spool_dir)
+    if pending and not overwrite:
+        raise RuntimeError(
+            f"Spool directory {spool_dir} has {len(pending)} segments that were not uploaded yet; "
+            f"run the uploader first or set SPOOL_OVERWRITE=1 to discard them"
+        )
+    if pending:
+        logger.warning("Discarding %s pending segments from spool directory %s", len(pending), spool_dir)
+    stale = glob.glob(os.path.join(spool_dir, f"{SEGMENT_PREFIX}*{SENT_SUFFIX}"))
+    stale += glob.glob(os.path.join(spool_dir, f"{SEGMENT_PREFIX}*.tmp"))
+    for path in pending + stale:
+        os.remove(path)
+
+
+def write_manifest(spool_dir: str, fingerprint: Optional[str]) -> None:
+    # The uploader needs the input fingerprint to derive the same idempotency keys
+    with open(os.path.join(spool_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump({"fingerprint": fingerprint}, f)
+
+
+def read_manifest(spool_dir: str) -> Dict[str, Any]:
+    path = os.path.join(spool_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        logger.warning("No manifest found in %s; idempotency keys will not include an input fingerprint", spool_dir)
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def segment_index(path: str) -> int:
+    name = os.path.basename(path)
+    return int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+
+
+def write_segment(spool_dir: str, index: int, records: List[Dict[str, Any]]) -> str:
+    if len(records) > MAX_SEGMENT_RECORDS:
+        raise ValueError(f"Segment of {len(records)} records exceeds API limit of {MAX_SEGMENT_RECORDS}")
+    path = segment_path(spool_dir, index)
+    # Written under a temporary name so the uploader never picks up a partial segment
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(encode_bulk_payload(records))
+    os.replace(tmp_path, path)
+    return path
+
+
+def pending_segments(spool_dir: str) -> List[str]:
+    return sorted(glob.glob(os.path.join(spool_dir, f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}")))
+
+
+class SpoolUploader:
+    def __init__(self, spool_dir: str, api_client: ApiClient, request_delay: float = 0.0, ledger: Optional[AckLedger] = None) -> None:
+        self.spool_dir: str = spool_dir
+        self.api_client: ApiClient = api_client
+        self.request_delay: float = request_delay
+        # Default to a ledger file in the spool so a crash between ack and rename can't resend a segment
+        self.ledger: AckLedger = ledger if ledger is not None else AckLedger(os.path.join(spool_dir, LEDGER_NAME))
+
+    def upload(self) -> Tuple[int, int]:
+        segments = pending_segments(self.spool_dir)
+        fingerprint = read_manifest(self.spool_dir).get("fingerprint") if segments else None
+        logger.info(f"Uploading {len(segments)} spooled segments from {self.spool_dir}")
+        sent = 0
+        failed = 0
+
+        for idx, path in enumerate(segments, start=1):
+            try:
+                with open(path, "rb") as f:
+                    payload = f.read()
+                key = batch_key(fingerprint, segment_index(path), payload)
+                if key in self.ledger:
+                    logger.info(f"Segment {os.path.basename(path)} already acknowledged (key {key[:12]}), skipping")
+                    os.replace(path, path + SENT_SUFFIX)
+                    sent += 1
+                    continue
+                logger.info(f"Sending segment {idx}/{len(segments)} ({os.path.basename(path)}, {len(payload)} bytes)")
+                _ = self.api_client.request(
+                    "POST",
+                    "banners/show/bulk",
+                    data=payload,
+                    headers={"Content-Type": "application/json", IDEMPOTENCY_HEADER: key},
+                )
+                self.ledger.record(key)
+                # Marked as sent so a re-run only retries what is left
+                os.replace(path, path + SENT_SUFFIX)
+                sent += 1
+            except Exception as e:
+                logger.error(f"Failed to send segment {os.path.basename(path)}: {e}")
+                failed += 1
+            if self.request_delay > 0 and idx < len(segments):
+                time.sleep(self.request_delay)
+
+        logger.info(f"Spool upload completed: {sent} segments sent, {failed} failed")
+        if failed > 0:
+            logger.warning(f"{failed} segments remain in {self.spool_dir}; re-run the uploader to retry them")
+        return sent, failed
@@ -3,33 +3,43 @@ import sys
 sys.path.append("/Library/Frameworks/Python.framework/Versions/3.10/lib/python3.10/site-packages")
 import requests
 import csv
+from typing import Optional
 
-def validate_row(row: dict) -> bool:
+REASON_BAD_NAME = "bad_name"
+REASON_BAD_AGE = "bad_age"
+REASON_BANNER_OUT_OF_RANGE = "banner_out_of_range"
+REASON_EMPTY_COOKIE = "empty_cookie"
+
+def rejection_reason(row: dict) -> Optional[str]:
+    # Reason code of the first failed check, or None for a valid row
     name = row.get("Name")
     age = row.get("Age")
     bannerId = row.get("Banner_id")
     cookie = row.get("Cookie")
 
     if not isinstance(name, str) or not name.strip():
-        return False
+        return REASON_BAD_NAME
     if not all(c.isalpha() or c.isspace() for c in name.strip()):
-        return False
+        return REASON_BAD_NAME
     try:
         age_int = int(age)
         if age_int <= 0:
-            return False
+            return REASON_BAD_AGE
     except (ValueError, TypeError):
-        return False
+        return REASON_BAD_AGE
     try:
         banner_int = int(bannerId)
         if banner_int < 0 or banner_int > 99:
-            return False
+            return REASON_BANNER_OUT_OF_RANGE
     except (ValueError, TypeError):
-        return False
+        return REASON_BANNER_OUT_OF_RANGE
 
     if not isinstance(cookie, str) or not cookie.strip():
-        return False
-    return True
+        return REASON_EMPTY_COOKIE
+    return None
+
+def validate_row(row: dict) -> bool:
+    return rejection_reason(row) is None
 
 def transform_row(row: dict) -> dict:
     return {
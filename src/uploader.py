@@ -0,0 +1,64 @@
+import os
+import logging
+import sys
+from auth import APIToken
+from client import ApiClient
+from http_handler import RequestHandler
+from spool import SpoolUploader
+from idempotency import AckLedger
+
+# Configure logging for production
+log_level = os.getenv("LOG_LEVEL", "INFO").upper()
+logging.basicConfig(
+    level=getattr(logging, log_level, logging.INFO),
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler(sys.stdout)
+    ]
+)
+logger = logging.getLogger(__name__)
+
+def main():
+    logger.info("Starting spool uploader")
+
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+        logger.info("Loaded configuration from .env file")
+    except ImportError:
+        logger.warning("python-dotenv not installed, using environment variables and defaults")
+
+    # Load configuration
+    server_url = os.getenv("SHOWADS_API_URL")
+    project_key = os.getenv("PROJECT_KEY")
+    spool_dir = os.getenv("SPOOL_DIR", "spool")
+    max_retries = int(os.getenv("MAX_RETRIES", "3"))
+    request_delay = float(os.getenv("REQUEST_DELAY", "0.5"))
+    ledger_path = os.getenv("IDEMPOTENCY_LEDGER") or None
+
+    # Validate required credentials
+    if not server_url:
+        logger.error("SHOWADS_API_URL not found in environment variables")
+        raise ValueError("SHOWADS_API_URL must be set in .env file")
+    if not project_key:
+        logger.error("PROJECT_KEY not found in environment variables")
+        raise ValueError("PROJECT_KEY must be set in .env file")
+
+    logger.info("Configuration loaded successfully")
+    logger.info(f"Spool directory: {spool_dir}")
+    logger.info(f"Server URL: {server_url}")
+    logger.info(f"Project Key: {project_key[:8]}...")  # Mask sensitive data
+
+    request_handler = RequestHandler(max_retries=max_retries)
+    auth_service = APIToken(server_url, project_key, request_handler)
+    api_client = ApiClient(server_url, auth_service, request_handler)
+
+    ledger = AckLedger(ledger_path) if ledger_path else None
+    _, failed = SpoolUploader(spool_dir, api_client, request_delay, ledger).upload()
+    if failed > 0:
+        raise RuntimeError(f"{failed} spooled segments could not be uploaded")
+
+    logger.info("Spool upload completed successfully!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.dirname(__file__))
+
+from csv_connector import CSVConnector
+from csv_connector_tests import make_rows
+from client import ApiClient
+from auth import APIToken
+from http_handler import RequestHandler
+from idempotency import AckLedger, IDEMPOTENCY_HEADER, batch_key
+from spool import SpoolUploader, SENT_SUFFIX
+from mock_server import ShowAdsStub
+
+
+class BatchKeyTests(unittest.TestCase):
+    def test_key_is_deterministic_and_input_sensitive(self):
+        key = batch_key("abc", 1, b'{"Data":[]}')
+        self.assertEqual(key, batch_key("abc", 1, b'{"Data":[]}'))
+        self.assertNotEqual(key, batch_key("abd", 1, b'{"Data":[]}'))
+        self.assertNotEqual(key, batch_key("abc", 2, b'{"Data":[]}'))
+        self.assertNotEqual(key, batch_key("abc", 1, b'{"Data":[{}]}'))
+
+    def test_ledger_persists_keys(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp_dir, "acked")
+            AckLedger(path).record("k1")
+            self.assertIn("k1", AckLedger(path))
+            self.assertNotIn("k2", AckLedger(path))
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+@patch("http_handler.time.sleep")
+@patch("http_handler.random.uniform", return_value=0.0)
+class ExactlyOnceTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.env = patch.dict(os.environ, {
+            "REQUEST_DELAY": "0",
+            "MAX_RETRIES": "3",
+            "IDEMPOTENCY_LEDGER": os.path.join(self.tmp_dir, "acked"),
+        })
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_lost_responses_are_retried_without_double_counting(self, _uniform, _sleep):
+        with ShowAdsStub() as stub:
+            connector = CSVConnector("/tmp/data.csv", stub.url, "proj", batch_size=1000, upload_mode="bulk")
+            # Fetch the token first so the injected 429 hits a bulk request, not /auth
+            connector.auth_service.get_token()
+            stub.fail_after_commit = 1
+            stub.drop_after_commit = 1
+            stub.throttle = 1
+            connector.write(make_rows(2255))
+
+            self.assertEqual(stub.throttle, 0)
+            self.assertGreater(stub.bulk_requests, 3)
+            self.assertEqual(stub.records_received, 2255)
+
+    def test_rerun_skips_acknowledged_batches(self, _uniform, _sleep):
+        with ShowAdsStub() as stub:
+            CSVConnector("/tmp/data.csv", stub.url, "proj", upload_mode="bulk").write(make_rows(2255))
+            self.assertEqual(stub.bulk_requests, 3)
+
+            CSVConnector("/tmp/data.csv", stub.url, "proj", upload_mode="bulk").write(make_rows(2255))
+            self.assertEqual(stub.bulk_requests, 3)
+            self.assertEqual(stub.records_received, 2255)
+
+    def test_spool_upload_uses_same_keys_as_connector(self, _uniform, _sleep):
+        spool_dir = os.path.join(self.tmp_dir, "spool")
+        with ShowAdsStub() as stub:
+            stub.fail_after_commit = 1
+            connector = CSVConnector("/tmp/data.csv", stub.url, "proj", upload_mode="spool", spool_dir=spool_dir)
+            connector.input_fingerprint = "fingerprint"
+            connector.write(make_rows(1500))
+
+            handler = RequestHandler(max_retries=3)
+            api_client = ApiClient(stub.url, APIToken(stub.url, "proj", handler), handler)
+            sent, failed = SpoolUploader(spool_dir, api_client, ledger=AckLedger(os.environ["IDEMPOTENCY_LEDGER"])).upload()
+
+            self.assertEqual((sent, failed), (2, 0))
+            self.assertEqual(stub.records_received, 1500)
+
+        # The direct bulk path derives identical keys, so nothing is sent twice
+        api_client = Mock()
+        connector = CSVConnector("/tmp/data.csv", "https://api", "proj", upload_mode="bulk")
+        connector.api_client = api_client
+        connector.input_fingerprint = "fingerprint"
+        connector.write(make_rows(1500))
+        api_client.request.assert_not_called()
+
+    def test_uploader_ledger_defaults_to_spool_dir(self, _uniform, _sleep):
+        spool_dir = os.path.join(self.tmp_dir, "spool")
+        connector = CSVConnector("/tmp/data.csv", "https://api", "proj", upload_mode="spool", spool_dir=spool_dir)
+        connector.write(make_rows(10))
+        api_client = Mock()
+        SpoolUploader(spool_dir, api_client).upload()
+
+        # Simulate a crash after the ack but before the segment was renamed to .sent
+        segment = os.path.join(spool_dir, "segment-000001.json")
+        os.replace(segment + SENT_SUFFIX, segment)
+        SpoolUploader(spool_dir, api_client).upload()
+
+        self.assertEqual(api_client.request.call_count, 1)
+        self.assertTrue(os.path.exists(segment + SENT_SUFFIX))
+
+    def test_bulk_requests_carry_idempotency_header(self, _uniform, _sleep):
+        api_client = Mock()
+        connector = CSVConnector("/tmp/data.csv", "https://api", "proj", upload_mode="bulk")
+        connector.api_client = api_client
+        connector.write(make_rows(10))
+
+        headers = api_client.request.call_args[1]["headers"]
+        self.assertEqual(len(headers[IDEMPOTENCY_HEADER]), 64)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
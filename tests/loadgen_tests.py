@@ -0,0 +1,56 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.dirname(__file__))
+
+from csv_connector import CSVConnector
+from client import ApiClient
+from loadgen import LoadGenerator, SingleAttemptRequestHandler, load_rows, percentile, synthetic_rows
+from transform import validate_row
+from mock_server import ShowAdsStub
+
+
+class LoadGeneratorTests(unittest.TestCase):
+    def test_synthetic_rows_are_valid(self):
+        self.assertTrue(all(validate_row(row) for row in synthetic_rows(200, seed=7)))
+
+    def test_percentile_nearest_rank(self):
+        values = [float(v) for v in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 99), 99.0)
+        self.assertEqual(percentile([], 90), 0.0)
+
+    def test_ramp_against_stand_in_server(self):
+        with ShowAdsStub() as stub:
+            connector = CSVConnector("/tmp/data.csv", stub.url, "proj", batch_size=10, upload_mode="bulk")
+            rows = load_rows(connector, "synthetic", 25)
+            api_client = ApiClient(stub.url, connector.auth_service, SingleAttemptRequestHandler())
+            generator = LoadGenerator(api_client, rows, "bulk", batch_size=10, concurrency=4)
+
+            api_client.auth_service.get_token()
+            stub.throttle = 2
+            results = generator.run([20, 400], unit="rows", step_duration=0.5)
+
+        first, second = results
+        # 20 rows/s with 10-row batches is 2 requests/s -> 1 request in 0.5s
+        self.assertEqual(first["requests"], 1)
+        self.assertEqual(second["requests"], 20)
+        self.assertEqual(first["status_counts"], {429: 1})
+        self.assertEqual(first["rate_429"], 1.0)
+        self.assertAlmostEqual(second["rate_429"], 1 / 20)
+        # Offered counts everything sent; achieved only what the server accepted
+        self.assertEqual(first["accepted_rows"], 0)
+        self.assertEqual(first["achieved_rows_per_sec"], 0.0)
+        self.assertGreater(first["offered_rows_per_sec"], 0.0)
+        self.assertEqual(second["rows"], 200)
+        self.assertEqual(stub.records_received, 190)
+        self.assertEqual(first["accepted_rows"] + second["accepted_rows"], stub.records_received)
+        self.assertLess(second["achieved_rows_per_sec"], second["offered_rows_per_sec"])
+        self.assertGreater(second["latency_max"], 0.0)
+        self.assertLessEqual(second["latency_p50"], second["latency_p99"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
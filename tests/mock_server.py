@@ -0,0 +1,98 @@
+"""
+Local stand-in for the ShowAds API used by the integration-style tests.
+
+Honours the Idempotency-Key header on bulk requests and can inject failures:
+- fail_after_commit: the next N bulk requests are processed but answered with 500 (lost response)
+- drop_after_commit: the next N bulk requests are processed but the connection is closed without a response
+- throttle: the next N requests of any kind are answered with 429 without being processed
+- auth_delay: seconds /auth takes to answer, to widen races between concurrent workers
+"""
+
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class ShowAdsStub:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.bulk_requests = 0
+        self.single_requests = 0
+        self.records_received = 0
+        self.auth_requests = 0
+        self.auth_delay = 0.0
+        self.seen_keys = set()
+        self.fail_after_commit = 0
+        self.drop_after_commit = 0
+        self.throttle = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self) -> "ShowAdsStub":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _reply(self, status, body=b""):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", "0"))
+                raw = self.rfile.read(length)
+
+                with stub.lock:
+                    if stub.throttle > 0:
+                        stub.throttle -= 1
+                        return self._reply(429)
+
+                if self.path == "/auth":
+                    with stub.lock:
+                        stub.auth_requests += 1
+                    if stub.auth_delay > 0:
+                        time.sleep(stub.auth_delay)
+                    return self._reply(200, json.dumps({"AccessToken": "stub-token"}).encode("utf-8"))
+                if self.path == "/banners/show":
+                    with stub.lock:
+                        stub.single_requests += 1
+                    return self._reply(200)
+                if self.path != "/banners/show/bulk":
+                    return self._reply(404)
+
+                key = self.headers.get("Idempotency-Key")
+                records = json.loads(raw)["Data"]
+                with stub.lock:
+                    stub.bulk_requests += 1
+                    if key is None or key not in stub.seen_keys:
+                        if key is not None:
+                            stub.seen_keys.add(key)
+                        stub.records_received += len(records)
+                    if stub.drop_after_commit > 0:
+                        stub.drop_after_commit -= 1
+                        self.close_connection = True
+                        self.connection.close()
+                        return
+                    if stub.fail_after_commit > 0:
+                        stub.fail_after_commit -= 1
+                        return self._reply(500)
+                return self._reply(200)
+
+        return Handler
@@ -0,0 +1,92 @@
+import os
+import sys
+import csv
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from csv_connector import CSVConnector
+from rejections import RejectionReport
+from transform import (
+    rejection_reason,
+    REASON_BAD_NAME,
+    REASON_BAD_AGE,
+    REASON_BANNER_OUT_OF_RANGE,
+    REASON_EMPTY_COOKIE,
+)
+
+
+def raw_row(name="John Doe", age="25", banner="15", cookie="abc-123"):
+    return {"Name": name, "Age": age, "Cookie": cookie, "Banner_id": banner}
+
+
+class RejectionReasonTests(unittest.TestCase):
+    def test_reason_codes(self):
+        self.assertIsNone(rejection_reason(raw_row()))
+        self.assertEqual(rejection_reason(raw_row(name="John123")), REASON_BAD_NAME)
+        self.assertEqual(rejection_reason(raw_row(name="")), REASON_BAD_NAME)
+        self.assertEqual(rejection_reason(raw_row(age="0")), REASON_BAD_AGE)
+        self.assertEqual(rejection_reason(raw_row(age="abc")), REASON_BAD_AGE)
+        self.assertEqual(rejection_reason(raw_row(banner="100")), REASON_BANNER_OUT_OF_RANGE)
+        self.assertEqual(rejection_reason(raw_row(banner="x")), REASON_BANNER_OUT_OF_RANGE)
+        self.assertEqual(rejection_reason(raw_row(cookie=" ")), REASON_EMPTY_COOKIE)
+
+
+class RejectionReportTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_counters_and_bounded_samples(self):
+        report = RejectionReport(sample_size=3, seed=1)
+        for i in range(100):
+            report.add(REASON_BAD_AGE, i + 1, raw_row(age="0"))
+        report.add(REASON_EMPTY_COOKIE, 101, raw_row(cookie=""))
+
+        self.assertEqual(report.counts[REASON_BAD_AGE], 100)
+        self.assertEqual(report.counts[REASON_EMPTY_COOKIE], 1)
+        self.assertEqual(report.total, 101)
+        self.assertEqual(len(report.samples[REASON_BAD_AGE]), 3)
+        self.assertEqual(len(report.samples[REASON_EMPTY_COOKIE]), 1)
+
+    @patch("csv_connector.ApiClient")
+    @patch("csv_connector.RequestHandler")
+    @patch("csv_connector.APIToken")
+    def test_transform_writes_rejected_rows_csv(self, _token, _handler, _api_client):
+        rejects_path = os.path.join(self.tmp_dir, "rejects.csv")
+        with patch.dict(os.environ, {"REJECTS_PATH": rejects_path}):
+            connector = CSVConnector("/tmp/data.csv", "https://api", "proj")
+        rows = [raw_row(), raw_row(name="Bad1"), raw_row(banner="150"), raw_row(name="Jane Roe")]
+
+        out = connector.transform(iter(rows))
+
+        self.assertEqual([r["customer_name"] for r in out], ["Jane Roe", "John Doe"])
+        report = connector.rejection_report
+        self.assertEqual(dict(report.counts), {REASON_BAD_NAME: 1, REASON_BANNER_OUT_OF_RANGE: 1})
+        with open(rejects_path, newline="", encoding="utf-8") as f:
+            rejected = list(csv.DictReader(f))
+        self.assertEqual([(r["Row"], r["Reason"]) for r in rejected],
+                         [("2", REASON_BAD_NAME), ("3", REASON_BANNER_OUT_OF_RANGE)])
+        self.assertEqual(rejected[0]["Name"], "Bad1")
+
+    def test_rejects_file_from_earlier_run_is_truncated_when_nothing_is_rejected(self):
+        rejects_path = os.path.join(self.tmp_dir, "rejects.csv")
+        with open(rejects_path, "w", encoding="utf-8") as f:
+            f.write("Row,Reason,Name\n7,bad_name,Old Row1\n")
+
+        report = RejectionReport(rejects_path=rejects_path)
+        report.close()
+        report.close()
+
+        with open(rejects_path, newline="", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines, ["Row,Reason,Name,Age,Cookie,Banner_id"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,163 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.dirname(__file__))
+
+from csv_connector import CSVConnector
+from csv_connector_tests import make_rows
+from interface import Sink
+from connector import fan_out
+from sinks import NdjsonSink, ColumnarSink
+from mock_server import ShowAdsStub
+
+
+class RecordingSink(Sink):
+    def __init__(self, name, batch_size, workers=1, gate=None, fail_batches=()):
+        self.name = name
+        self.batch_size = batch_size
+        self.workers = workers
+        self.gate = gate
+        self.fail_batches = set(fail_batches)
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def write_batch(self, batch_num, rows):
+        if self.gate is not None:
+            self.gate.wait(5)
+        if batch_num in self.fail_batches:
+            raise RuntimeError("sink down")
+        with self.lock:
+            self.batches.append((batch_num, len(rows)))
+        return len(rows)
+
+
+class FanOutTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_one_pass_feeds_every_sink_with_its_own_batching(self):
+        upload = RecordingSink("upload", batch_size=1000)
+        ndjson_path = os.path.join(self.tmp_dir, "archive.ndjson")
+        columnar_path = os.path.join(self.tmp_dir, "archive.columnar.json")
+
+        results = fan_out(make_rows(2255), [upload, NdjsonSink(ndjson_path, 500), ColumnarSink(columnar_path, 2000)])
+
+        self.assertEqual(results, {"upload": (2255, 0), "ndjson": (2255, 0), "columnar": (2255, 0)})
+        self.assertEqual(upload.batches, [(1, 1000), (2, 1000), (3, 255)])
+        with open(ndjson_path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 2255)
+        self.assertEqual(json.loads(lines[0])["customer_cookies"], "cookie-0")
+        with open(columnar_path, encoding="utf-8") as f:
+            groups = [json.loads(line) for line in f]
+        self.assertEqual([g["num_rows"] for g in groups], [2000, 255])
+        self.assertEqual(groups[1]["columns"]["customer_name"][0], "User 2000")
+
+    def test_failed_batches_are_counted_per_sink(self):
+        flaky = RecordingSink("flaky", batch_size=10, fail_batches={2})
+        healthy = RecordingSink("healthy", batch_size=10)
+
+        results = fan_out(make_rows(30), [flaky, healthy])
+
+        self.assertEqual(results["flaky"], (20, 10))
+        self.assertEqual(results["healthy"], (30, 0))
+
+    def test_slow_sink_does_not_serialize_other_sinks(self):
+        gate = threading.Event()
+        slow = RecordingSink("slow", batch_size=2, gate=gate)
+        fast = RecordingSink("fast", batch_size=1)
+
+        worker = threading.Thread(target=fan_out, args=(make_rows(10), [slow, fast], 10))
+        worker.start()
+        deadline = time.monotonic() + 5
+        while len(fast.batches) < 10 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(len(fast.batches), 10)
+        self.assertEqual(slow.batches, [])
+        gate.set()
+        worker.join(5)
+        self.assertEqual(len(slow.batches), 5)
+
+    def test_slow_sink_applies_backpressure_to_the_stream(self):
+        gate = threading.Event()
+        slow = RecordingSink("slow", batch_size=1, gate=gate)
+        consumed = []
+
+        def rows():
+            for row in make_rows(50):
+                consumed.append(row)
+                yield row
+
+        worker = threading.Thread(target=fan_out, args=(rows(), [slow], 1))
+        worker.start()
+        time.sleep(0.2)
+        # One batch in the worker, one in the queue, one blocked on put
+        self.assertLessEqual(len(consumed), 3)
+        gate.set()
+        worker.join(5)
+        self.assertEqual(len(consumed), 50)
+        self.assertEqual(len(slow.batches), 50)
+
+    def test_every_sink_is_finished_when_one_close_fails(self):
+        class BrokenCloseSink(RecordingSink):
+            def close(self):
+                raise OSError("disk full")
+
+        broken = BrokenCloseSink("broken", batch_size=10)
+        ndjson_path = os.path.join(self.tmp_dir, "archive.ndjson")
+        archive = NdjsonSink(ndjson_path, 10)
+        healthy = RecordingSink("ok2", batch_size=10, workers=2)
+
+        with self.assertRaises(OSError):
+            fan_out(make_rows(25), [broken, archive, healthy])
+
+        self.assertFalse([t for t in threading.enumerate() if t.name.startswith(("ok2-", "ndjson-"))])
+        self.assertEqual(sum(n for _, n in healthy.batches), 25)
+        self.assertIsNone(archive._file)
+        with open(ndjson_path, encoding="utf-8") as f:
+            self.assertEqual(len(f.read().splitlines()), 25)
+
+    def test_concurrent_upload_workers_authenticate_once(self):
+        with ShowAdsStub() as stub:
+            stub.auth_delay = 0.2
+            with patch.dict(os.environ, {"REQUEST_DELAY": "0", "UPLOAD_WORKERS": "4"}):
+                connector = CSVConnector("/tmp/data.csv", stub.url, "proj", batch_size=100, upload_mode="bulk")
+                connector.write(make_rows(800))
+
+            self.assertEqual(stub.auth_requests, 1)
+            self.assertEqual(stub.bulk_requests, 8)
+            self.assertEqual(stub.records_received, 800)
+
+    @patch("csv_connector.ApiClient")
+    @patch("csv_connector.RequestHandler")
+    @patch("csv_connector.APIToken")
+    def test_connector_uploads_and_archives_in_one_pass(self, _token, _handler, api_client_cls):
+        api_client = Mock()
+        api_client.request.return_value = {"status": "success"}
+        api_client_cls.return_value = api_client
+        ndjson_path = os.path.join(self.tmp_dir, "archive.ndjson")
+
+        connector = CSVConnector("/tmp/data.csv", "https://api", "proj", batch_size=1000, upload_mode="bulk")
+        with patch.dict(os.environ, {"REQUEST_DELAY": "0", "ARCHIVE_NDJSON_PATH": ndjson_path}):
+            self.assertEqual([s.name for s in connector.sinks()], ["showads-bulk", "ndjson"])
+            connector.write(make_rows(1500))
+
+        self.assertEqual(api_client.request.call_count, 2)
+        with open(ndjson_path, encoding="utf-8") as f:
+            self.assertEqual(len(f.read().splitlines()), 1500)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,107 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.dirname(__file__))
+
+from csv_connector import CSVConnector
+from csv_connector_tests import make_rows
+from spool import SpoolUploader, pending_segments, SENT_SUFFIX
+
+
+class SpoolTests(unittest.TestCase):
+    def setUp(self):
+        self.spool_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.spool_dir, ignore_errors=True)
+
+    @patch("csv_connector.ApiClient")
+    @patch("csv_connector.RequestHandler")
+    @patch("csv_connector.APIToken")
+    def test_spool_mode_writes_segments_instead_of_posting(self, _token, _handler, api_client_cls):
+        api_client = Mock()
+        api_client_cls.return_value = api_client
+
+        connector = CSVConnector("/tmp/data.csv", "https://api", "proj", batch_size=1000,
+                                 upload_mode="spool", spool_dir=self.spool_dir)
+        connector.write(make_rows(2255))
+
+        api_client.request.assert_not_called()
+        segments = pending_segments(self.spool_dir)
+        self.assertEqual([os.path.basename(p) for p in segments],
+                         ["segment-000001.json", "segment-000002.json", "segment-000003.json"])
+        with open(segments[0], "rb") as f:
+            first = json.loads(f.read())
+        self.assertEqual(len(first["Data"]), 1000)
+        self.assertEqual(first["Data"][0], {"VisitorCookie": "cookie-0", "BannerId": 15})
+        with open(segments[-1], "rb") as f:
+            self.assertEqual(len(json.loads(f.read())["Data"]), 255)
+
+    @patch("csv_connector.ApiClient")
+    @patch("csv_connector.RequestHandler")
+    @patch("csv_connector.APIToken")
+    def test_uploader_sends_pre_encoded_bytes_and_is_rerunnable(self, _token, _handler, _api_client_cls):
+        connector = CSVConnector("/tmp/data.csv", "https://api", "proj", batch_size=1000,
+                                 upload_mode="spool", spool_dir=self.spool_dir)
+        connector.write(make_rows(1500))
+        segments = pending_segments(self.spool_dir)
+        with open(segments[0], "rb") as f:
+            expected_first = f.read()
+
+        api_client = Mock()
+        # Second segment fails on the first run
+        api_client.request.side_effect = [{"status": "success"}, Exception("boom")]
+        sent, failed = SpoolUploader(self.spool_dir, api_client).upload()
+
+        self.assertEqual((sent, failed), (1, 1))
+        args, kwargs = api_client.request.call_args_list[0]
+        self.assertEqual(args[:2], ("POST", "banners/show/bulk"))
+        self.assertEqual(kwargs["data"], expected_first)
+        self.assertEqual(kwargs["headers"]["Content-Type"], "application/json")
+        self.assertTrue(os.path.exists(segments[0] + SENT_SUFFIX))
+
+        # Re-run only retries what is left
+        api_client.request.side_effect = None
+        api_client.request.return_value = {"status": "success"}
+        sent, failed = SpoolUploader(self.spool_dir, api_client).upload()
+        self.assertEqual((sent, failed), (1, 0))
+        self.assertEqual(api_client.request.call_count, 3)
+        self.assertEqual(pending_segments(self.spool_dir), [])
+
+    @patch("csv_connector.ApiClient")
+    @patch("csv_connector.RequestHandler")
+    @patch("csv_connector.APIToken")
+    def test_spool_refuses_to_discard_pending_segments(self, _token, _handler, _api_client_cls):
+        connector = CSVConnector("/tmp/data.csv", "https://api", "proj", batch_size=1000,
+                                 upload_mode="spool", spool_dir=self.spool_dir)
+        connector.write(make_rows(1500))
+        api_client = Mock()
+        api_client.request.side_effect = [{"status": "success"}, Exception("boom")]
+        SpoolUploader(self.spool_dir, api_client).upload()
+        undelivered = pending_segments(self.spool_dir)
+        with open(undelivered[0], "rb") as f:
+            undelivered_payload = f.read()
+
+        with self.assertRaises(RuntimeError):
+            connector.write(make_rows(10))
+        self.assertEqual(pending_segments(self.spool_dir), undelivered)
+        with open(undelivered[0], "rb") as f:
+            self.assertEqual(f.read(), undelivered_payload)
+
+        # Explicit overwrite discards them and clears uploaded segments too
+        with patch.dict(os.environ, {"SPOOL_OVERWRITE": "1"}):
+            connector = CSVConnector("/tmp/data.csv", "https://api", "proj", batch_size=1000,
+                                     upload_mode="spool", spool_dir=self.spool_dir)
+        connector.write(make_rows(10))
+        self.assertEqual([os.path.basename(p) for p in os.listdir(self.spool_dir) if p.startswith("segment-")],
+                         ["segment-000001.json"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)